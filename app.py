@@ -1,10 +1,24 @@
 from flask import Flask, render_template, request
-from serpapi import GoogleSearch
+from jinja2 import FileSystemBytecodeCache
+from flask_compress import Compress
+import orjson
+import redis
 import re
 import os
+import sys
 import time
+import itertools
 import logging
-from collections import defaultdict
+import atexit
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from types import MappingProxyType
+from collections import deque
+from functools import lru_cache
+from operator import itemgetter
+from threading import Event, RLock
+from concurrent.futures import ThreadPoolExecutor
+from cachetools import TTLCache
 
 
 TRUSTED_STORES = [
@@ -60,6 +74,14 @@ from food_backend import food_bp
 app = Flask(__name__)
 app.register_blueprint(food_bp)
 
+# Compiled templates are shared on disk, so new workers skip parsing them
+app.jinja_env.bytecode_cache = FileSystemBytecodeCache()
+
+# Product listing pages are large and repetitive; compress them on the wire
+app.config["COMPRESS_ALGORITHM"] = ["br", "gzip"]
+app.config["COMPRESS_MIN_SIZE"] = 512
+Compress(app)
+
 # ===============================
 # SECURITY / RATE LIMIT
 # ===============================
@@ -67,30 +89,130 @@ RATE_LIMIT = 50
 WINDOW_SIZE = 60
 BLOCK_TIME = 2 * 60
 CACHE_TTL = 20 * 60
+SWEEP_EVERY = 1024  # requests between sweeps of idle IPs
 
-request_log = defaultdict(list)
+request_log = {}
 blocked_ips = {}
-cache = {}
-query_counter = defaultdict(list)
+# Entries live for 2 × CACHE_TTL: fresh for the first half, then served stale
+# while a background refresh runs
+cache = TTLCache(maxsize=1024, ttl=2 * CACHE_TTL)
+cache_lock = RLock()
+refreshing = set()
+inflight = {}  # cache_key -> [Event set when the leading fetch finishes, its products]
+refresh_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="serpapi-refresh")
+sweep_counter = itertools.count()
+
+
+# ===============================
+# REDIS (optional)
+# ===============================
+REDIS_URL = os.getenv("REDIS_URL")
+
+# Shared by every gunicorn worker for the search cache and rate limits;
+# without it both fall back to per-process state
+redis_client = redis.Redis(
+    connection_pool=redis.BlockingConnectionPool.from_url(
+        REDIS_URL, max_connections=16, timeout=2, socket_timeout=2
+    )
+) if REDIS_URL else None
+
+# Token bucket per IP: refills `rate` tokens/sec up to `capacity`. Returns 0 when
+# allowed, -1 when this request triggers a block, or the remaining block seconds.
+TOKEN_BUCKET_LUA = """
+local block_ttl = redis.call("TTL", KEYS[2])
+if block_ttl > 0 then
+    return block_ttl
+end
+
+local capacity = tonumber(ARGV[1])
+local rate     = tonumber(ARGV[2])
+local now      = tonumber(ARGV[3])
+
+local state  = redis.call("HMGET", KEYS[1], "tokens", "ts")
+local tokens = tonumber(state[1]) or capacity
+local ts     = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+
+local allowed = tokens >= 1
+if allowed then
+    tokens = tokens - 1
+end
+redis.call("HSET", KEYS[1], "tokens", tostring(tokens), "ts", tostring(now))
+redis.call("EXPIRE", KEYS[1], math.ceil(capacity / rate))
+
+if allowed then
+    return 0
+end
+redis.call("SET", KEYS[2], 1, "EX", ARGV[4])
+return -1
+"""
+token_bucket = redis_client.register_script(TOKEN_BUCKET_LUA) if redis_client else None
+
+REDIS_ERROR_REPORT_INTERVAL = 60  # seconds between Sentry events while Redis is down
+last_redis_error_report = 0.0
+
+
+def report_redis_error(e):
+    # Every request hits Redis, so an outage would otherwise send one event per
+    # cache read, cache write and rate-limit check
+    global last_redis_error_report
+    now = time.monotonic()
+    if now - last_redis_error_report >= REDIS_ERROR_REPORT_INTERVAL:
+        last_redis_error_report = now
+        sentry_sdk.capture_exception(e)
 
 
 # ===============================
 # LOGGING
 # ===============================
-logging.basicConfig(level=logging.INFO)
+# Request threads only enqueue records; a listener thread does the stream I/O
+log_queue = queue.SimpleQueue()
+log_listener = QueueListener(log_queue, logging.StreamHandler())
+logging.basicConfig(level=logging.INFO, handlers=[QueueHandler(log_queue)])
+log_listener.start()
+atexit.register(log_listener.stop)
 
 
 # ===============================
 # HELPERS
 # ===============================
 def get_client_ip():
-    return request.headers.get("CF-Connecting-IP") or request.remote_addr
+    headers = request.headers
+
+    cf_ip = headers.get("CF-Connecting-IP")
+    if cf_ip:
+        return cf_ip
+
+    # Behind the Heroku/Azure router remote_addr is the proxy; the client is the first hop
+    forwarded = headers.get("X-Forwarded-For")
+    if forwarded:
+        return forwarded.split(",", 1)[0].strip()
 
-def extract_price(p):
+    return request.remote_addr
+
+PRICE_STRIP = str.maketrans("", "", "₹,\u00a0")
+NO_PRICE    = sys.float_info.max  # sorts after every real price; finite so it survives JSON
+
+@lru_cache(maxsize=4096)
+def parse_price(price):
     try:
-        return float(p.get("price", "").replace("₹", "").replace(",", ""))
-    except:
-        return float("inf")
+        return float(price.translate(PRICE_STRIP))
+    except Exception:
+        return NO_PRICE
+
+# Parsed once in shape_product; NO_PRICE when the listing has no usable price
+extract_price = itemgetter("_price_num")
+
+def sort_by_price(products):
+    # Returns a new list: `products` may be the shared cached list, which must
+    # not be reordered in place under threaded workers
+    if len(products) < 2:
+        return products
+    return sorted(products, key=extract_price)
+
+def compile_any(words):
+    # One alternation scan instead of a Python-level `any(w in text ...)` loop
+    return re.compile("|".join(re.escape(w) for w in words))
 
 def is_valid_query(q):
     if not q:
@@ -102,35 +224,39 @@ def is_valid_query(q):
 # ===============================
 # STEP 1 – SAFE FILTER
 # ===============================
+PHONE_BLOCK_WORDS = [
+    "case", "cover", "back cover", "skin",
+    "tempered", "glass", "screen protector",
+    "charger", "cable", "adapter",
+    "holder", "stand", "mount",
+    "sell", "selling", "used", "second hand",
+    "refurbished", "pre owned", "exchange",
+    "sports", "jersey", "tshirt", "toy",
+    "dummy", "model", "poster", "display"
+]
+PHONE_KEYWORDS = ["iphone", "mobile", "smartphone"]
+
+PHONE_BLOCK_RE   = compile_any(PHONE_BLOCK_WORDS)
+PHONE_KEYWORD_RE = compile_any(PHONE_KEYWORDS)
+
+
 def step1_strict_filter(products, query):
     if not products:
         return products
 
     q_words = query.lower().split()
 
-    BLOCK_WORDS = [
-        "case", "cover", "back cover", "skin",
-        "tempered", "glass", "screen protector",
-        "charger", "cable", "adapter",
-        "holder", "stand", "mount",
-        "sell", "selling", "used", "second hand",
-        "refurbished", "pre owned", "exchange",
-        "sports", "jersey", "tshirt", "toy",
-        "dummy", "model", "poster", "display"
-    ]
-
     filtered = []
 
     for p in products:
-        title = p.get("title", "").lower()
+        title = p["_title_lc"]
         if not title:
             continue
 
-        if any(b in title for b in BLOCK_WORDS):
+        if PHONE_BLOCK_RE.search(title):
             continue
 
-        PHONE_KEYWORDS = ["iphone", "mobile", "smartphone"]
-        if not any(k in title for k in PHONE_KEYWORDS):
+        if not PHONE_KEYWORD_RE.search(title):
             continue
 
         if any(w in title for w in q_words):
@@ -144,7 +270,7 @@ def step1_strict_filter(products, query):
 # ===============================
 def step2_group_variants(products):
     for p in products:
-        title = p.get("title", "").lower()
+        title = p["_title_lc"]
 
         if "pro max" in title:
             p["variant"] = "Pro Max"
@@ -161,25 +287,31 @@ def step2_group_variants(products):
 # ===============================
 # STEP 3 – COMPARE & PICK BEST PRICE
 # ===============================
+PARENS_RE       = re.compile(r"\(.*?\)")
+NON_ALNUM_RE    = re.compile(r"[^a-z0-9\s]")
+SPACES_RE       = re.compile(r"\s+")
+IPHONE_MODEL_RE = re.compile(r"iphone\s*(\d+)")
+
+
 def normalize_title(title):
-    t = title.lower()
-    t = re.sub(r"\(.*?\)", "", t)
-    t = re.sub(r"[^a-z0-9\s]", "", t)
-    t = re.sub(r"\s+", " ", t).strip()
+    # Expects an already lowercased title (see "_title_lc")
+    t = PARENS_RE.sub("", title)
+    t = NON_ALNUM_RE.sub("", t)
+    t = SPACES_RE.sub(" ", t).strip()
     return t
 
 
 def build_product_key(p):
-    title = normalize_title(p.get("title", ""))
+    title = normalize_title(p["_title_lc"])
     words = title.split()
     key = " ".join(words[:5])
     return key
 
 
 def clean_display_title(p):
-    title = p.get("title", "").lower()
+    title = p["_title_lc"]
 
-    m = re.search(r"iphone\s*(\d+)", title)
+    m = IPHONE_MODEL_RE.search(title)
     model = m.group(1) if m else ""
 
     if "pro max" in title:
@@ -196,6 +328,12 @@ def clean_display_title(p):
     return p.get("title", "")
 
 
+TRUSTED_STORE_RE = compile_any(TRUSTED_STORES)
+
+offer_price = itemgetter("price")
+best_price  = itemgetter("best_price")
+
+
 def step3_compare_products(products):
     grouped = {}
 
@@ -203,7 +341,7 @@ def step3_compare_products(products):
         key = build_product_key(p)
         price = extract_price(p)
 
-        if price == float("inf"):
+        if price == NO_PRICE:
             continue
 
         if key not in grouped:
@@ -228,14 +366,13 @@ def step3_compare_products(products):
         others = []
 
         for offer in product["offers"]:
-            store_name = offer["store"].lower()
-            if any(ts in store_name for ts in TRUSTED_STORES):
+            if TRUSTED_STORE_RE.search(offer["store"].lower()):
                 preferred.append(offer)
             else:
                 others.append(offer)
 
-        preferred.sort(key=lambda x: x["price"])
-        others.sort(key=lambda x: x["price"])
+        preferred.sort(key=offer_price)
+        others.sort(key=offer_price)
 
         product["offers"] = preferred + others
 
@@ -252,45 +389,143 @@ def step3_compare_products(products):
 # ===============================
 # SERPAPI
 # ===============================
+from serpapi_client import SERPAPI_URL, SERPAPI_KEY, SERPAPI_BASE_PARAMS, serpapi_session
+
+GOOGLE_SHOPPING_URL = "https://www.google.com/search?tbm=shop&q="
+
+if not SERPAPI_KEY:
+    logging.warning("SERPAPI_KEY is not set; live price searches will fail")
+
+
+def shape_product(item):
+    get   = item.get
+    title = get("title", "")
+    price = get("price", "")
+
+    # SerpAPI usually sends the numeric price already; parse the string otherwise
+    price_num = get("extracted_price")
+    if not isinstance(price_num, (int, float)):
+        price_num = parse_price(price)
+    link  = (
+        get("link")
+        or get("product_link")
+        or GOOGLE_SHOPPING_URL + SPACES_RE.sub("+", title)
+    )
+
+    return {
+        "title": title,
+        "_title_lc": title.lower(),
+        "price": price,
+        "_price_num": price_num,
+        "store": get("source", ""),
+        "image": get("thumbnail", ""),
+        "link":  link
+    }
+
+
+# ===============================
+# RESULT CACHE
+# ===============================
+REDIS_PREFIX = "serp:v2:"  # bump when the shape_product() fields change
+
+
+def cache_get(cache_key):
+    if redis_client is not None:
+        try:
+            raw = redis_client.get(REDIS_PREFIX + cache_key)
+        except redis.RedisError as e:
+            report_redis_error(e)  # Redis down — fall back to the per-process cache
+        else:
+            if raw is None:
+                return None
+            products, fetched_at = orjson.loads(raw)
+            return products, fetched_at
+
+    with cache_lock:
+        return cache.get(cache_key)
+
+
+def cache_set(cache_key, products):
+    # Wall-clock timestamp so entries written by other workers compare correctly
+    entry = (products, time.time())
+
+    if redis_client is not None:
+        try:
+            redis_client.setex(REDIS_PREFIX + cache_key, 2 * CACHE_TTL, orjson.dumps(entry))
+            return
+        except redis.RedisError as e:
+            report_redis_error(e)  # Redis down — keep the result in the per-process cache
+
+    with cache_lock:
+        cache[cache_key] = entry
+
+
 def get_product_prices(query):
     cache_key = query.lower().strip()
-    now = time.time()
-
-    if cache_key in cache:
-        data, ts = cache[cache_key]
-        if now - ts < CACHE_TTL:
-            return data
-
-    params = {
-        "engine":   "google_shopping",
-        "q":        query,
-        "location": "India",
-        "hl":       "en",
-        "gl":       "in",
-        "api_key":  os.getenv("SERPAPI_KEY")
-    }
+    entry = cache_get(cache_key)
+
+    if entry is not None:
+        products, fetched_at = entry
+        if time.time() - fetched_at >= CACHE_TTL:
+            schedule_refresh(query, cache_key)
+        return products
+
+    return fetch_once(query, cache_key)
+
+
+def fetch_once(query, cache_key):
+    # Concurrent misses for the same query wait on one SerpAPI call
+    with cache_lock:
+        flight = inflight.get(cache_key)
+        leader = flight is None
+        if leader:
+            flight = inflight[cache_key] = [Event(), []]
+
+    done = flight[0]
+
+    if not leader:
+        # The leader hands its result over directly; the cache is only a
+        # fallback if it is still fetching when the wait times out
+        if done.wait(timeout=15):
+            return flight[1]
+        entry = cache_get(cache_key)
+        return entry[0] if entry is not None else []
+
+    try:
+        flight[1] = fetch_product_prices(query, cache_key)
+        return flight[1]
+    finally:
+        with cache_lock:
+            inflight.pop(cache_key, None)
+        done.set()
+
+
+def schedule_refresh(query, cache_key):
+    with cache_lock:
+        if cache_key in refreshing:
+            return
+        refreshing.add(cache_key)
+    refresh_pool.submit(refresh_cache_entry, query, cache_key)
+
+
+def refresh_cache_entry(query, cache_key):
+    try:
+        fetch_product_prices(query, cache_key)
+    finally:
+        with cache_lock:
+            refreshing.discard(cache_key)
+
+
+def fetch_product_prices(query, cache_key):
+    params = {**SERPAPI_BASE_PARAMS, "q": query}
 
     try:
-        results = GoogleSearch(params).get_dict()
-        products = []
-
-        for item in results.get("shopping_results", []):
-            title = item.get("title", "")
-            link  = (
-                item.get("link")
-                or item.get("product_link")
-                or "https://www.google.com/search?tbm=shop&q=" + re.sub(r"\s+", "+", title)
-            )
-
-            products.append({
-                "title": title,
-                "price": item.get("price", ""),
-                "store": item.get("source", ""),
-                "image": item.get("thumbnail", ""),
-                "link":  link
-            })
-
-        cache[cache_key] = (products, now)
+        resp = serpapi_session.get(SERPAPI_URL, params=params, timeout=(3, 10))
+        resp.raise_for_status()
+        results = orjson.loads(resp.content)
+        products = [shape_product(item) for item in results.get("shopping_results", ())]
+
+        cache_set(cache_key, products)
         return products
 
     except Exception as e:
@@ -367,6 +602,31 @@ def render_newly_blocked_page():
 # ===============================
 # RATE LIMITING — FIXED
 # ===============================
+def sweep_rate_limit_state(now):
+    # Forget IPs with no hits left in the window and blocks that have expired,
+    # otherwise every IP ever seen stays in memory
+    cutoff = now - WINDOW_SIZE
+    for ip, hits in list(request_log.items()):
+        if not hits or hits[-1] <= cutoff:
+            request_log.pop(ip, None)
+    for ip, blocked_until in list(blocked_ips.items()):
+        if blocked_until <= now:
+            blocked_ips.pop(ip, None)
+
+
+def redis_rate_limit(ip):
+    # Same budget as the in-memory window (RATE_LIMIT per WINDOW_SIZE), but
+    # enforced across workers and allowing bursts up to RATE_LIMIT
+    try:
+        return int(token_bucket(
+            keys=[f"bucket:{ip}", f"blocked:{ip}"],
+            args=[RATE_LIMIT, RATE_LIMIT / WINDOW_SIZE, time.time(), BLOCK_TIME],
+        ))
+    except redis.RedisError as e:
+        report_redis_error(e)
+        return None
+
+
 @app.before_request
 def rate_limit():
     # Skip rate limiting for health check and static files
@@ -376,31 +636,53 @@ def rate_limit():
         return None
 
     ip = get_client_ip()
-    now = time.time()
+
+    if token_bucket is not None:
+        status = redis_rate_limit(ip)
+        if status is not None:
+            if status > 0:
+                logging.warning("Blocked IP tried again: %s", ip)
+                return render_already_blocked_page(status)
+            if status < 0:
+                logging.warning("IP blocked for exceeding rate limit: %s", ip)
+                return render_newly_blocked_page()
+            return None
+        # Redis unavailable — fall through to the per-process limiter
+
+    now = time.monotonic()
+
+    if next(sweep_counter) % SWEEP_EVERY == 0:
+        sweep_rate_limit_state(now)
 
     # Check if IP is currently blocked
-    if ip in blocked_ips:
-        blocked_until = blocked_ips[ip]
+    blocked_until = blocked_ips.get(ip)
+    if blocked_until is not None:
         if now < blocked_until:
             retry_after = int(blocked_until - now)
-            logging.warning(f"Blocked IP tried again: {ip}")
+            logging.warning("Blocked IP tried again: %s", ip)
             return render_already_blocked_page(retry_after)  # ← RETURN here
         else:
             # Block expired — clear it
-            del blocked_ips[ip]
-            request_log[ip] = []
+            blocked_ips.pop(ip, None)
+            request_log.pop(ip, None)
+
+    hits = request_log.get(ip)
+    if hits is None:
+        hits = request_log[ip] = deque()
 
-    # Clean old requests outside the window
-    request_log[ip] = [t for t in request_log[ip] if now - t < WINDOW_SIZE]
+    # Drop old requests outside the window (oldest are on the left)
+    cutoff = now - WINDOW_SIZE
+    while hits and hits[0] <= cutoff:
+        hits.popleft()
 
     # Check if over limit — FIXED: return is now INSIDE this if block
-    if len(request_log[ip]) >= RATE_LIMIT:
+    if len(hits) >= RATE_LIMIT:
         blocked_ips[ip] = now + BLOCK_TIME
-        logging.warning(f"IP blocked for exceeding rate limit: {ip}")
+        logging.warning("IP blocked for exceeding rate limit: %s", ip)
         return render_newly_blocked_page()  # ← RETURN inside if block
 
     # Only reached if NOT blocked — log request and allow
-    request_log[ip].append(now)
+    hits.append(now)
     return None
 
 
@@ -409,24 +691,22 @@ def rate_limit():
 # ===============================
 @app.route("/", methods=["GET", "POST"])
 def index():
-    products = []
-    variants = None
-    query = ""
+    query = request.form.get("product_query", "").strip() if request.method == "POST" else ""
 
-    if request.method == "POST":
-        raw_query = request.form.get("product_query", "").strip()
-        query = raw_query
+    # Empty and invalid searches render the blank page without touching the cache
+    if not is_valid_query(query):
+        return render_template("index.html", products=[], variants=None)
 
-        if is_valid_query(query):
-            raw = get_product_prices(query)
+    raw = get_product_prices(query)
 
-            filtered = step1_strict_filter(raw, query)
-            if not filtered:
-                filtered = raw
+    filtered = step1_strict_filter(raw, query)
+    if not filtered:
+        filtered = raw
 
-            variants = step2_group_variants(filtered)
-            products = step3_compare_products(variants)
-            products = sorted(products, key=lambda x: x["best_price"])
+    variants = step2_group_variants(filtered)
+    products = step3_compare_products(variants)
+    if len(products) > 1:
+        products.sort(key=best_price)
 
     return render_template(
         "index.html",
@@ -438,51 +718,60 @@ def index():
 # ===============================
 # MEDICINE FILTER
 # ===============================
+MEDICINE_BLOCK_WORDS = [
+    "mobile", "phone", "smartphone", "iphone", "samsung",
+    "laptop", "tablet", "headphone", "earphone", "charger",
+    "cover", "case", "cable", "watch", "camera",
+    "shirt", "shoe", "toy", "book", "furniture"
+]
+
+MEDICINE_KEYWORDS = [
+    "tablet", "capsule", "syrup", "drops", "cream", "gel",
+    "ointment", "injection", "sachet", "strip", "mg", "ml",
+    "medicine", "pharma", "healthcare", "drug", "supplement",
+    "vitamin", "protein", "pain", "relief", "antibiotic"
+]
+
+PHARMACY_STORES          = ["1mg", "netmeds", "pharmeasy", "apollo", "medplus", "flipkart health"]
+FALLBACK_PHARMACY_STORES = ["1mg", "netmeds", "pharmeasy", "apollo", "medplus"]
+
+MEDICINE_BLOCK_RE   = compile_any(MEDICINE_BLOCK_WORDS)
+MEDICINE_KEYWORD_RE = compile_any(MEDICINE_KEYWORDS)
+
+
 def medicine_filter(products, query):
     if not products:
         return products
 
     q_words = query.lower().replace("buy online india", "").split()
-
-    BLOCK_WORDS = [
-        "mobile", "phone", "smartphone", "iphone", "samsung",
-        "laptop", "tablet", "headphone", "earphone", "charger",
-        "cover", "case", "cable", "watch", "camera",
-        "shirt", "shoe", "toy", "book", "furniture"
-    ]
-
-    MEDICINE_KEYWORDS = [
-        "tablet", "capsule", "syrup", "drops", "cream", "gel",
-        "ointment", "injection", "sachet", "strip", "mg", "ml",
-        "medicine", "pharma", "healthcare", "drug", "supplement",
-        "vitamin", "protein", "pain", "relief", "antibiotic"
-    ]
+    match_words = [w for w in q_words if len(w) > 2]
 
     filtered = []
     for p in products:
-        title = p.get("title", "").lower()
-        store = p.get("store", "").lower()
-
+        title = p["_title_lc"]
         if not title:
             continue
 
-        if any(b in title for b in BLOCK_WORDS):
+        # Cheapest test first: most off-topic results never reach the regexes
+        if not any(w in title for w in match_words):
             continue
 
-        pharmacy_stores = ["1mg", "netmeds", "pharmeasy", "apollo", "medplus", "flipkart health"]
-        is_pharmacy = any(ph in store for ph in pharmacy_stores)
+        if MEDICINE_BLOCK_RE.search(title):
+            continue
 
-        has_medicine_word = any(k in title for k in MEDICINE_KEYWORDS)
-        query_match = any(w in title for w in q_words if len(w) > 2)
+        if MEDICINE_KEYWORD_RE.search(title):
+            filtered.append(p)
+            continue
 
-        if (has_medicine_word or is_pharmacy) and query_match:
+        store = p.get("store", "").lower()
+        if any(ph in store for ph in PHARMACY_STORES):
             filtered.append(p)
 
     if not filtered:
         filtered = [
             p for p in products
             if any(ph in p.get("store", "").lower()
-                   for ph in ["1mg", "netmeds", "pharmeasy", "apollo", "medplus"])
+                   for ph in FALLBACK_PHARMACY_STORES)
         ]
 
     return filtered if filtered else products
@@ -491,21 +780,21 @@ def medicine_filter(products, query):
 # ===============================
 # CATEGORY ROUTE
 # ===============================
+CATEGORY_MAP = MappingProxyType({
+    "mobiles":   "mobile phone",
+    "laptops":   "laptop",
+    "fruits":    "fresh fruits",
+    "groceries": "grocery items",
+    "medicine":  "medicine online India"
+})
+
+
 @app.route("/category/<category_name>", methods=["GET", "POST"])
 def category_page(category_name):
-    category_rules = {
-        "mobiles":   "mobile phone",
-        "laptops":   "laptop",
-        "fruits":    "fresh fruits",
-        "groceries": "grocery items",
-        "medicine":  "medicine online India"
-    }
-
-    if category_name not in category_rules:
+    base_query = CATEGORY_MAP.get(category_name)
+    if base_query is None:
         return render_template("category.html", category=category_name, products=[])
 
-    base_query = category_rules[category_name]
-
     if request.method == "POST":
         search_term = request.form.get("search", "").strip()
 
@@ -524,7 +813,7 @@ def category_page(category_name):
     elif category_name == "medicine":
         products = medicine_filter(products, final_query)
 
-    products = sorted(products, key=extract_price)
+    products = sort_by_price(products)
 
     return render_template(
         "category.html",
@@ -533,6 +822,21 @@ def category_page(category_name):
     )
 
 
+# ===============================
+# CACHE PREWARM
+# ===============================
+def prewarm_cache():
+    # Fetch the default category queries in the background so the first
+    # visitor after a deploy hits a warm cache
+    for query in CATEGORY_MAP.values():
+        refresh_pool.submit(get_product_prices, query)
+
+
+# Opt-in so local runs don't spend SerpAPI quota on every restart
+if os.getenv("PREWARM") == "1":
+    prewarm_cache()
+
+
 # ===============================
 # API ROUTE
 # ===============================
@@ -546,18 +850,10 @@ def price_check():
     if not products:
         return {"current_price": None, "link": None}
 
-    def safe_price(p):
-        try:
-            return float(p.get("price", "").replace("₹", "").replace(",", ""))
-        except:
-            return float("inf")
-
-    products_sorted = sorted(products, key=safe_price)
-    best = products_sorted[0]
+    best = min(products, key=extract_price)
 
-    try:
-        price = float(best.get("price", "").replace("₹", "").replace(",", ""))
-    except:
+    price = extract_price(best)
+    if price == NO_PRICE:
         price = None
 
     return {
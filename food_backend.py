@@ -1,10 +1,12 @@
 from flask import Blueprint, render_template, request
-from serpapi import GoogleSearch
-import os
+import orjson
 import re
 import time
 import logging
-import socket
+from types import MappingProxyType
+from serpapi_client import SERPAPI_URL, SERPAPI_BASE_PARAMS, serpapi_session
+
+__all__ = ["food_bp"]
 
 # ===============================
 # BLUEPRINT
@@ -17,10 +19,14 @@ food_bp = Blueprint("food", __name__, url_prefix="/food")
 food_cache = {}
 FOOD_CACHE_TTL = 30 * 60  # 30 minutes
 
+GOOGLE_URL          = "https://www.google.com"
+GOOGLE_SHOPPING_URL = GOOGLE_URL + "/search?tbm=shop&q="
+OFFICIAL_SOURCES    = ["mcdonald", "pizza hut", "domino", "official"]
+
 # ===============================
 # MENU DATA
 # ===============================
-FOOD_DATA = {
+FOOD_DATA = MappingProxyType({
     "mcdonalds": {
         "name": "McDonald's",
         "menu": {
@@ -243,17 +249,22 @@ FOOD_DATA = {
             "zomato":   "https://www.zomato.com/search?q=dominos",
         }
     },
-}
+})
 
 
 # ===============================
 # HELPERS
 # ===============================
+SLUG_STRIP_RE = re.compile(r"[^a-z0-9\s-]")
+SLUG_JOIN_RE  = re.compile(r"[-\s]+")
+
 def slugify(text: str) -> str:
     """Robust slug generator — handles special chars, spaces, hyphens."""
+    if text.isascii() and text.isalnum() and text.islower():
+        return text  # already a slug, nothing for the regexes to do
     text = text.lower()
-    text = re.sub(r"[^a-z0-9\s-]", "", text)
-    text = re.sub(r"[-\s]+", "-", text.strip())
+    text = SLUG_STRIP_RE.sub("", text)
+    text = SLUG_JOIN_RE.sub("-", text.strip())
     return text
 
 def item_to_slug(item: str) -> str:
@@ -263,6 +274,19 @@ def slug_to_item(slug: str) -> str:
     return slug.replace("-", " ").title()
 
 
+# brand_key -> {item slug -> item name}, built once from the static menus
+SLUG_INDEX = {
+    brand_key: {slugify(item): item for items in brand["menu"].values() for item in items}
+    for brand_key, brand in FOOD_DATA.items()
+}
+
+# brand_key -> (official order link, brand name joined for search URLs)
+BRAND_LINK_PARTS = {
+    brand_key: (brand["buy_links"].get("official", "#"), brand["name"].replace(" ", "+"))
+    for brand_key, brand in FOOD_DATA.items()
+}
+
+
 # ===============================
 # LIVE PRICE FETCHER — SerpAPI
 # ===============================
@@ -283,8 +307,8 @@ def get_prices_for_item(brand_key, item_name):
         if now - ts < FOOD_CACHE_TTL:
             return data
 
-    item_query  = item_name.replace(" ", "+")
-    brand_query = brand_name.replace(" ", "+")
+    official_link, brand_query = BRAND_LINK_PARTS.get(brand_key, ("#", ""))
+    search_terms = f"{item_name.replace(' ', '+')}+{brand_query}"
 
     # ── Start with hardcoded fallback ──
     prices = {
@@ -293,57 +317,48 @@ def get_prices_for_item(brand_key, item_name):
         "zomato":   base.get("zomato"),
     }
     buy_links = {
-        "official": brand.get("buy_links", {}).get("official", "#"),
-        "swiggy":   f"https://www.swiggy.com/search?query={item_query}+{brand_query}",
-        "zomato":   f"https://www.zomato.com/search?q={item_query}+{brand_query}",
+        "official": official_link,
+        "swiggy":   f"https://www.swiggy.com/search?query={search_terms}",
+        "zomato":   f"https://www.zomato.com/search?q={search_terms}",
     }
 
     # ── Try SerpAPI for live prices + real links ──
-    _prev_timeout = socket.getdefaulttimeout()
     try:
-        socket.setdefaulttimeout(20)
-        params = {
-            "engine":   "google_shopping",
-            "q":        f"{item_name} {brand_name} price India",
-            "location": "India",
-            "hl":       "en",
-            "gl":       "in",
-            "api_key":  os.getenv("SERPAPI_KEY")
-        }
-        results = GoogleSearch(params).get_dict()
+        params = {**SERPAPI_BASE_PARAMS, "q": f"{item_name} {brand_name} price India"}
+        resp = serpapi_session.get(SERPAPI_URL, params=params, timeout=(3, 20))
+        resp.raise_for_status()
+        results = orjson.loads(resp.content)
+        fallback_link = GOOGLE_SHOPPING_URL + search_terms
 
         for item in results.get("shopping_results", []):
-            source    = item.get("source", "").lower()
-            price_str = item.get("price", "")
-            link      = item.get("link") or item.get("product_link") or ""
+            source = item.get("source", "").lower()
 
-            if link.startswith("/"):
-                link = "https://www.google.com" + link
-            if not link.startswith("http"):
-                link = f"https://www.google.com/search?tbm=shop&q={item_query}+{brand_query}"
+            # Pick the slot first so unused results skip price/link parsing
+            if "swiggy" in source and not prices["swiggy"]:
+                slot = "swiggy"
+            elif "zomato" in source and not prices["zomato"]:
+                slot = "zomato"
+            elif any(x in source for x in OFFICIAL_SOURCES) and not prices["official"]:
+                slot = "official"
+            else:
+                continue
 
             try:
-                price = int(float(price_str.replace("₹", "").replace(",", "").strip()))
+                price = int(float(item.get("price", "").replace("₹", "").replace(",", "").strip()))
             except:
                 continue
 
-            if "swiggy" in source and not prices["swiggy"]:
-                prices["swiggy"]    = price
-                buy_links["swiggy"] = link
-
-            elif "zomato" in source and not prices["zomato"]:
-                prices["zomato"]    = price
-                buy_links["zomato"] = link
+            link = item.get("link") or item.get("product_link") or ""
+            if link.startswith("/"):
+                link = GOOGLE_URL + link
+            if not link.startswith("http"):
+                link = fallback_link
 
-            elif any(x in source for x in ["mcdonald", "pizza hut", "domino", "official"]) \
-                 and not prices["official"]:
-                prices["official"]    = price
-                buy_links["official"] = link
+            prices[slot]    = price
+            buy_links[slot] = link
 
     except Exception as e:
-        logging.error(f"SerpAPI food error: {e}")
-    finally:
-        socket.setdefaulttimeout(_prev_timeout)
+        logging.error("SerpAPI food error: %s", e)
 
     result = {"prices": prices, "buy_links": buy_links}
     food_cache[cache_key] = (result, now)
@@ -379,9 +394,8 @@ def food_item_page(brand, item_slug):
     if not brand_data:
         return render_template("food.html", error="Brand not found."), 404
 
-    # ── Robust slug matching using slugify ──
-    all_items = [i for items in brand_data["menu"].values() for i in items]
-    matched   = next((i for i in all_items if slugify(i) == item_slug.lower()), None)
+    # ── Slugs are precomputed in SLUG_INDEX ──
+    matched = SLUG_INDEX[brand].get(item_slug.lower())
 
     if not matched:
         return render_template(
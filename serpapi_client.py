@@ -0,0 +1,28 @@
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import os
+from types import MappingProxyType
+
+# ===============================
+# SERPAPI CLIENT (shared by app.py and food_backend.py)
+# ===============================
+SERPAPI_URL = "https://serpapi.com/search.json"
+SERPAPI_KEY = os.getenv("SERPAPI_KEY")
+
+SERPAPI_BASE_PARAMS = MappingProxyType({
+    "engine":   "google_shopping",
+    "location": "India",
+    "hl":       "en",
+    "gl":       "in",
+    "api_key":  SERPAPI_KEY
+})
+
+# One pooled session so repeat searches reuse the TLS connection.
+# Only connection setup is retried; a retried read would re-run the search.
+serpapi_session = requests.Session()
+serpapi_session.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=20,
+    max_retries=Retry(total=2, connect=2, read=0, status=0, backoff_factor=0.2),
+))